@@ -1,23 +1,34 @@
 """
 '''
 Description: the simple image converter's engine
-Version: 1.0.0.20211018
+Version: 1.1.0.20261019
 Author: Arvin Zhao
 Date: 2021-09-19 23:17:09
 Last Editors: Arvin Zhao
-LastEditTime: 2021-10-18 10:40:52
+LastEditTime: 2026-10-19 10:12:36
 '''
 """
 
-from pathlib import Path
+from io import BytesIO
+from pathlib import Path, PurePosixPath
 from shutil import copy2, rmtree
 from tqdm import tqdm
+from typing import Iterator, Optional, Tuple, Union
 import os
+import tarfile
+import time
+import zipfile
+import zlib
 
 from PIL import Image
 
 from src.pysic.errors import EmptyInputError
-from src.pysic.pillow_gif_patch import ALPHA_THRESHOLD, save_transparent_gif
+from src.pysic.pillow_gif_patch import (
+    ALPHA_THRESHOLD,
+    QUANTIZE_PRESET,
+    get_quantize_preset,
+    save_transparent_gif,
+)
 
 
 class SIC:
@@ -29,22 +40,38 @@ class SIC:
         Parameters
         ----------
         input_path : str
-            The path to an input image or the directory for locating the input image(s).
+            The path to an input image, the directory for locating the input image(s), or a ZIP/TAR archive containing
+            the input image(s).
         has_pbar : bool, optional
             A flag indicating whether to show the progress bar or not (the default is `True`).
         """
+        self.__ARCHIVE_MODES = {
+            ".tar": "w",
+            ".tar.bz2": "w:bz2",
+            ".tar.gz": "w:gz",
+            ".tar.xz": "w:xz",
+            ".tbz2": "w:bz2",
+            ".tgz": "w:gz",
+            ".txz": "w:xz",
+            ".zip": "w",
+        }  # A dictionary of the archive extensions supported by the engine and the corresponding writing modes.
         self.__IMG_FMTS_VALID = [
             "gif",
             "png",
         ]  # A list of the image formats supported by the engine.
+        self.__INPUT_ARCHIVE_INVALID = "not a valid ZIP/TAR archive: "
         self.__INPUT_NOT_FOUND = "no such input path/directory: "
         self.__OUTPUT_FOLDER = (
             "output_"  # Part of the default output folder name (output_<extension>).
         )
 
         self.__has_pbar = has_pbar
-        self.__input_path = input_path
+        self.__input_archive = None
+        self.__input_members = None
+        self.__input_path = os.fspath(input_path)
+        self.__output_archive = None
         self.__output_dir = None
+        self.__output_names = None
 
     def __convert(
         self,
@@ -54,6 +81,7 @@ class SIC:
         has_input_structure: bool = True,
         input_path: str = None,
         output_dir: str = "",
+        quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
     ) -> list:
         """Process the image conversion tasks.
 
@@ -72,6 +100,9 @@ class SIC:
             (the default is `None`).
         output_dir : str, optional
             The output directory for the converted image(s), useful for a part of the tasks (the default is `None`).
+        quantize_preset : str or dict, optional
+            The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys for quantising the GIF
+            image(s) (the default is defined by a constant `QUANTIZE_PRESET`).
 
         Returns
         -------
@@ -86,12 +117,22 @@ class SIC:
             The path to an input image or the directory for locating the input image(s) does not exist. Check the input
             path.
         ValueError
-            The target image format for conversion is not supported. Check the target format. This error comes from a
-            called function.
+            The target image format for conversion or the quantize preset is not supported, or the input archive is
+            corrupt. Check the target format, the preset name, or the input path. This error comes from a called
+            function.
         """
         input_path = self.__input_path if input_path is None else input_path
         fail_tasks = []
 
+        if self.__is_input_archive(input_path=input_path):
+            return self.__convert_archive(
+                alpha_threshold=alpha_threshold,
+                has_init_pbar=has_init_pbar,
+                has_input_structure=has_input_structure,
+                quantize_preset=quantize_preset,
+                to_fmt=to_fmt,
+            )
+
         if has_init_pbar:
             self.__init_pbar()
 
@@ -100,6 +141,7 @@ class SIC:
                 alpha_threshold=alpha_threshold,
                 input_path=input_path,
                 output_dir=output_dir,
+                quantize_preset=quantize_preset,
                 to_fmt=to_fmt,
             ):
                 fail_tasks.append(input_path)
@@ -113,7 +155,7 @@ class SIC:
 
                     for entry in entries:
                         count += 1
-                        self.__convert(
+                        fail_tasks += self.__convert(
                             alpha_threshold=alpha_threshold,
                             input_path=entry.path,
                             output_dir=os.path.join(
@@ -124,6 +166,7 @@ class SIC:
                             )
                             if has_input_structure
                             else self.__output_dir,
+                            quantize_preset=quantize_preset,
                             to_fmt=to_fmt,
                         )
 
@@ -134,8 +177,90 @@ class SIC:
 
         return fail_tasks
 
+    def __convert_archive(
+        self,
+        alpha_threshold: int,
+        has_init_pbar: bool,
+        has_input_structure: bool,
+        quantize_preset: Union[str, dict],
+        to_fmt: str,
+    ) -> list:
+        """Process the image conversion tasks for the images in the input archive, which is only opened once.
+
+        Parameters
+        ----------
+        alpha_threshold : int
+            The threshold for the alpha channel.
+        has_init_pbar : bool
+            A flag indicating if the progress bar should be initialised.
+        has_input_structure : bool
+            A flag indicating if the file structure of the input archive should be kept.
+        quantize_preset : str or dict
+            The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys for quantising the GIF
+            image(s).
+        to_fmt : str
+            The target image format for conversion.
+
+        Returns
+        -------
+        list
+            A list of failed conversion tasks.
+
+        Raises
+        ------
+        EmptyInputError
+            The input archive contains no image for conversion. Check the input path.
+        ValueError
+            The target image format for conversion or the quantize preset is not supported, or the input archive is
+            corrupt. Check the target format, the preset name, or the input path. This error comes from a called
+            function.
+        """
+        fail_tasks = []
+        count = 0
+        self.__open_input_archive()
+
+        try:
+            if has_init_pbar:
+                self.__init_pbar()
+
+            for member_name, data in self.__read_archive():
+                count += 1
+                name = self.__sanitise_member_name(name=member_name)
+
+                if not name or not self.__convert_img(
+                    alpha_threshold=alpha_threshold,
+                    input_file=BytesIO(data),
+                    input_path=name,
+                    output_dir=os.path.join(
+                        self.__output_dir, *PurePosixPath(name).parts[:-1]
+                    )
+                    if has_input_structure
+                    else self.__output_dir,
+                    quantize_preset=quantize_preset,
+                    to_fmt=to_fmt,
+                ):
+                    fail_tasks.append(self.__input_path + ":" + member_name)
+
+                if self.__has_pbar:
+                    self.__pbar.update()
+        finally:
+            self.__input_archive.close()
+            self.__input_archive = None
+            self.__input_members = None
+
+        if count == 0:
+            raise EmptyInputError
+
+        return fail_tasks
+
     def __convert_img(
-        self, alpha_threshold: int, input_path: str, output_dir: str, to_fmt: str
+        self,
+        alpha_threshold: int,
+        input_path: str,
+        output_dir: str,
+        to_fmt: str,
+        input_file: BytesIO = None,
+        quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
     ) -> bool:
         """Convert an input image to an image of the specified format.
 
@@ -147,11 +272,16 @@ class SIC:
         alpha_threshold : int
             The threshold for the alpha channel.
         input_path : str
-            The path to an input image.
+            The path to an input image, or the member name of an input image if it is read from an input archive.
         output_dir : str
-            The output directory for the converted image.
+            The output directory for the converted image, relative to the archive root if the output archive is used.
         to_fmt : str
             The target image format for conversion.
+        input_file : BytesIO, optional
+            The in-memory content of an input image read from an input archive (the default is `None`).
+        quantize_preset : str or dict, optional
+            The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys for quantising the GIF image
+            (the default is defined by a constant `QUANTIZE_PRESET`).
 
         Returns
         -------
@@ -161,7 +291,8 @@ class SIC:
         Raises
         ------
         ValueError
-            The target image format for conversion is not supported. Check the target format.
+            The target image format for conversion or the quantize preset is not supported. Check the target format or
+            the preset name.
         """
         to_fmt = to_fmt.lower()
 
@@ -174,31 +305,75 @@ class SIC:
         ext = ext.lower()
         ext_target = "." + to_fmt  # The target extension.
 
-        if not os.path.isdir(output_dir):
+        if self.__output_archive is None and not os.path.isdir(output_dir):
             os.makedirs(output_dir)
 
         if ext == ext_target:
-            copy2(input_path, output_dir)
-        else:
-            try:
-                with Image.open(input_path) as im:
-                    output_path = os.path.join(
-                        output_dir, f + ext_target
-                    )  # The output path to the converted image.
+            if input_file is None and self.__output_archive is None:
+                copy2(input_path, output_dir)
+                return True
 
-                    if to_fmt == "gif":
-                        save_transparent_gif(
-                            alpha_threshold=alpha_threshold,
-                            durations=0,
-                            images=[im],
-                            save_file=output_path,
-                        )
-                    else:
-                        im.save(format=to_fmt, fp=output_path)
+            if input_file is None:
+                with open(input_path, "rb") as img:
+                    return self.__write(
+                        data=img.read(),
+                        output_path=os.path.join(output_dir, f + ext),
+                    )
 
-                return True
-            except OSError:
-                return False
+            return self.__write(
+                data=input_file.getvalue(),
+                output_path=os.path.join(output_dir, f + ext),
+            )
+
+        try:
+            with Image.open(input_path if input_file is None else input_file) as im:
+                output_path = os.path.join(
+                    output_dir, f + ext_target
+                )  # The output path to the converted image.
+                output_file = (
+                    output_path if self.__output_archive is None else BytesIO()
+                )  # Write to the memory first if the output archive is used.
+
+                if to_fmt == "gif":
+                    save_transparent_gif(
+                        alpha_threshold=alpha_threshold,
+                        durations=0,
+                        images=[im],
+                        quantize_preset=quantize_preset,
+                        save_file=output_file,
+                    )
+                else:
+                    im.save(format=to_fmt, fp=output_file)
+
+                if self.__output_archive is not None:
+                    return self.__write(
+                        data=output_file.getvalue(), output_path=output_path
+                    )
+
+            return True
+        except OSError:
+            return False
+
+    def __get_archive_ext(self, path: str) -> Optional[str]:
+        """Return the archive extension of a path.
+
+        Parameters
+        ----------
+        path : str
+            The path to be checked.
+
+        Returns
+        -------
+        Optional[str]
+            The archive extension of the path if it is supported by the engine, otherwise `None`.
+        """
+        path = os.fspath(path).lower()
+
+        for ext in self.__ARCHIVE_MODES:
+            if path.endswith(ext):
+                return ext
+
+        return None
 
     def __init_pbar(self):
         """Initialise the progress bar."""
@@ -207,7 +382,7 @@ class SIC:
         else:
             self.__pbar = None
 
-    def __plan(self, input_path: str, count: int = 0) -> int:
+    def __plan(self, input_path: str, count: int = 0) -> Optional[int]:
         """Count the number of conversion tasks.
 
         Parameters
@@ -219,8 +394,8 @@ class SIC:
 
         Returns
         -------
-        int
-            The number of conversion tasks.
+        Optional[int]
+            The number of conversion tasks, or `None` if it is unknown for a compressed TAR input archive.
 
         Raises
         ------
@@ -228,6 +403,9 @@ class SIC:
             The path to an input image or the directory for locating the input image(s) does not exist. Check the input
             path.
         """
+        if self.__input_archive is not None and input_path == self.__input_path:
+            return None if self.__input_members is None else len(self.__input_members)
+
         if os.path.isfile(input_path):
             return 1
 
@@ -242,14 +420,164 @@ class SIC:
 
         raise FileNotFoundError(self.__INPUT_NOT_FOUND + input_path)
 
+    def __is_input_archive(self, input_path: str) -> bool:
+        """Check if a path is the input archive rather than an input image or the directory for locating the input
+        image(s).
+
+        Parameters
+        ----------
+        input_path : str
+            The path to be checked.
+
+        Returns
+        -------
+        bool
+            A flag indicating if the path is the input archive.
+        """
+        return (
+            input_path == self.__input_path
+            and os.path.isfile(input_path)
+            and self.__get_archive_ext(path=input_path) is not None
+        )
+
+    def __open_input_archive(self) -> None:
+        """Open the input archive and list its images.
+
+        The images in a compressed TAR archive are not listed in advance because it would decompress the whole archive
+        twice.
+
+        Raises
+        ------
+        ValueError
+            The input archive is corrupt. Check the input path.
+        """
+        try:
+            if zipfile.is_zipfile(self.__input_path):
+                self.__input_archive = zipfile.ZipFile(self.__input_path)
+                self.__input_members = [
+                    info
+                    for info in self.__input_archive.infolist()
+                    if not info.is_dir()
+                ]
+            else:
+                self.__input_archive = tarfile.open(self.__input_path)
+                self.__input_members = (
+                    [
+                        member
+                        for member in self.__input_archive.getmembers()
+                        if member.isfile()
+                    ]
+                    if self.__get_archive_ext(path=self.__input_path) == ".tar"
+                    else None
+                )
+        except (EOFError, tarfile.TarError, zipfile.BadZipFile, zlib.error) as e:
+            if self.__input_archive is not None:
+                self.__input_archive.close()
+                self.__input_archive = None
+
+            raise ValueError(self.__INPUT_ARCHIVE_INVALID + self.__input_path) from e
+
+    def __read_archive(self) -> Iterator[Tuple[str, bytes]]:
+        """Read the images in the opened input archive one by one without extracting them to the disk.
+
+        Yields
+        ------
+        Tuple[str, bytes]
+            The member name and the content of an input image.
+
+        Raises
+        ------
+        ValueError
+            The input archive is corrupt. Check the input path.
+        """
+        try:
+            if isinstance(self.__input_archive, zipfile.ZipFile):
+                for info in self.__input_members:
+                    yield info.filename, self.__input_archive.read(info)
+            else:
+                for member in (
+                    self.__input_archive
+                    if self.__input_members is None
+                    else self.__input_members
+                ):
+                    if member.isfile():
+                        yield member.name, self.__input_archive.extractfile(
+                            member
+                        ).read()
+        except (EOFError, tarfile.TarError, zipfile.BadZipFile, zlib.error) as e:
+            raise ValueError(self.__INPUT_ARCHIVE_INVALID + self.__input_path) from e
+
+    @staticmethod
+    def __sanitise_member_name(name: str) -> str:
+        """Remove the parts of an archive member name that could point outside the output directory.
+
+        Parameters
+        ----------
+        name : str
+            The member name in an archive.
+
+        Returns
+        -------
+        str
+            The sanitised member name, which is empty if nothing is left.
+        """
+        # Backslashes and drive letters could also point outside the output directory on Windows.
+        parts = [
+            part
+            for part in PurePosixPath(name).parts
+            if part not in ("/", ".", "..") and "\\" not in part and ":" not in part
+        ]
+        return str(PurePosixPath(*parts)) if parts else ""
+
+    def __write(self, data: bytes, output_path: str) -> bool:
+        """Write the content of an output image to the output archive or the disk.
+
+        Parameters
+        ----------
+        data : bytes
+            The content of an output image.
+        output_path : str
+            The output path to the output image, relative to the archive root if the output archive is used.
+
+        Returns
+        -------
+        bool
+            A flag indicating if the writing is successful. It fails if the output archive already has a member with
+            the same name.
+        """
+        if self.__output_archive is None:
+            with open(output_path, "wb") as img:
+                img.write(data)
+
+            return True
+
+        name = Path(output_path).as_posix()
+
+        if name in self.__output_names:
+            return False
+
+        self.__output_names.add(name)
+
+        if isinstance(self.__output_archive, zipfile.ZipFile):
+            self.__output_archive.writestr(zinfo_or_arcname=name, data=data)
+        else:
+            info = tarfile.TarInfo(name=name)
+            info.mtime = time.time()
+            info.size = len(data)
+            self.__output_archive.addfile(fileobj=BytesIO(data), tarinfo=info)
+
+        return True
+
     def convert(
         self,
         to_fmt: str,
         alpha_threshold: int = ALPHA_THRESHOLD,
         has_init_output: bool = False,
         has_input_structure: bool = True,
+        output_archive: str = None,
         output_dir: str = None,
-    ) -> None:
+        quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
+    ) -> list:
         """Perform the image conversion tasks requested by the user.
 
         Parameters
@@ -259,57 +587,137 @@ class SIC:
         alpha_threshold : int, optional
             The threshold for the alpha channel (the default is defined by a constant `ALPHA_THRESHOLD`).
         has_init_output : bool, optional
-            A flag indicating if the output directory should be cleaned up first (the default is `False`).
+            A flag indicating if the output directory/archive should be cleaned up first (the default is `False`).
         has_input_structure : bool, optional
-            A flag indicating if the file structure of the input directory should be kept (the default is `True`).
+            A flag indicating if the file structure of the input directory/archive should be kept (the default is
+            `True`).
+        output_archive : str, optional
+            The path to a ZIP/TAR archive for the converted image(s), which overrides `output_dir` if specified (the
+            default is `None`).
         output_dir : str, optional
             The output directory for the converted image(s) (the default is `None`).
+        quantize_preset : str or dict, optional
+            The name of a preset in `QUANTIZE_PRESETS` (`"web"`, `"fast"`, `"balanced"`, or `"quality"`), or a
+            dictionary with the same keys (`colors`, `dither`, and `method`) for quantising the GIF image(s) (the
+            default is defined by a constant `QUANTIZE_PRESET`).
 
         Returns
         -------
+        list
+            A list of failed conversion tasks.
+
+        Raises
+        ------
         EmptyInputError
-            The input directory contains no image for conversion. Check the input path. This error comes from a called
-            function.
+            The input directory/archive contains no image for conversion. Check the input path. This error comes from a
+            called function.
         FileExistsError
-            The output directory is not empty. Check the output directory.
+            The output directory is not empty, or the output archive exists. Check the output directory/archive.
         FileNotFoundError
             The path to an input image or the directory for locating the input image(s) does not exist. Check the input
             path. This error comes from a called function.
         ValueError
-            The target image format for conversion is not supported. Check the target format. This error comes from a
-            called function.
+            The target image format for conversion, the output archive format, or the quantize preset is not supported,
+            or the input archive is corrupt. Check the target format, the output archive path, the preset name, or the
+            input path. This error can also come from a called function.
         """
-        self.__output_dir = (
-            os.path.join(
-                os.path.dirname(os.path.abspath(self.__input_path)),
-                self.__OUTPUT_FOLDER + to_fmt.lower(),
+        quantize_preset = get_quantize_preset(
+            quantize_preset=quantize_preset
+        )  # Validate the preset before any output is created.
+
+        if self.__is_input_archive(input_path=self.__input_path) and not (
+            zipfile.is_zipfile(self.__input_path)
+            or tarfile.is_tarfile(self.__input_path)
+        ):
+            raise ValueError(self.__INPUT_ARCHIVE_INVALID + self.__input_path)
+
+        if output_archive is not None:
+            output_archive = os.fspath(output_archive)
+            archive_ext = self.__get_archive_ext(path=output_archive)
+
+            if archive_ext is None:
+                raise ValueError(
+                    output_archive + " is not an archive format supported by SIC"
+                )
+
+            if os.path.isfile(output_archive):
+                if has_init_output:
+                    os.remove(output_archive)
+                else:
+                    raise FileExistsError("the output archive exists")
+
+            output_archive_dir = os.path.dirname(os.path.abspath(output_archive))
+
+            if not os.path.isdir(output_archive_dir):
+                os.makedirs(output_archive_dir)
+
+            self.__output_archive = (
+                zipfile.ZipFile(
+                    compression=zipfile.ZIP_STORED,  # The images are compressed already.
+                    file=output_archive,
+                    mode="w",
+                )
+                if archive_ext == ".zip"
+                else tarfile.open(
+                    mode=self.__ARCHIVE_MODES[archive_ext], name=output_archive
+                )
             )
-            if output_dir is None
-            else output_dir
-        )
+            self.__output_dir = ""  # The archive root.
+            self.__output_names = set()
+            is_done = False
 
-        if os.path.isdir(self.__output_dir):
-            if has_init_output:
-                try:
-                    rmtree(self.__output_dir)
-                except Exception:
-                    raise FileExistsError(
-                        "you may need to empty the output directory manually"
-                    )
-            elif sum(1 for _ in os.scandir(self.__output_dir)) > 0:
-                raise FileExistsError("the output directory is not empty")
-
-        fail_tasks = self.__convert(
-            alpha_threshold=alpha_threshold,
-            output_dir=self.__output_dir,
-            has_init_pbar=True,
-            has_input_structure=has_input_structure,
-            to_fmt=to_fmt,
-        )
+            try:
+                fail_tasks = self.__convert(
+                    alpha_threshold=alpha_threshold,
+                    output_dir=self.__output_dir,
+                    has_init_pbar=True,
+                    has_input_structure=has_input_structure,
+                    quantize_preset=quantize_preset,
+                    to_fmt=to_fmt,
+                )
+                is_done = True
+            finally:
+                self.__output_archive.close()
+                self.__output_archive = None
+                self.__output_names = None
+
+                if not is_done:
+                    os.remove(output_archive)  # Do not leave a partly written archive.
+        else:
+            self.__output_dir = (
+                os.path.join(
+                    os.path.dirname(os.path.abspath(self.__input_path)),
+                    self.__OUTPUT_FOLDER + to_fmt.lower(),
+                )
+                if output_dir is None
+                else output_dir
+            )
+
+            if os.path.isdir(self.__output_dir):
+                if has_init_output:
+                    try:
+                        rmtree(self.__output_dir)
+                    except Exception:
+                        raise FileExistsError(
+                            "you may need to empty the output directory manually"
+                        )
+                elif sum(1 for _ in os.scandir(self.__output_dir)) > 0:
+                    raise FileExistsError("the output directory is not empty")
+
+            fail_tasks = self.__convert(
+                alpha_threshold=alpha_threshold,
+                output_dir=self.__output_dir,
+                has_init_pbar=True,
+                has_input_structure=has_input_structure,
+                quantize_preset=quantize_preset,
+                to_fmt=to_fmt,
+            )
 
         for fail_task in fail_tasks:
             print("Failed to convert", fail_task)
 
+        return fail_tasks
+
 
 # For simple tests only.
 if __name__ == "__main__":
@@ -1,11 +1,11 @@
 """
 '''
 Description: user-defined exceptions for SIC
-Version: 1.0.0.20211011
+Version: 1.1.0.20261019
 Author: Arvin Zhao
 Date: 2021-10-05 16:59:04
 Last Editors: Arvin Zhao
-LastEditTime: 2021-10-11 01:13:13
+LastEditTime: 2026-10-19 13:24:18
 '''
 """
 
@@ -24,3 +24,18 @@ class EmptyInputError(Exception):
             The error message (the default is "image(s) for conversion not found").
         """
         super().__init__(message)
+
+
+class ServerError(Exception):
+    """The class for defining the user-defined exception indicating that the server for SIC fails to run a job."""
+
+    def __init__(self, message: str = "the server failed to run the job") -> None:
+        """The constructor of the class for defining the user-defined exception indicating that the server for SIC
+        fails to run a job.
+
+        Parameters
+        ----------
+        message : str, optional
+            The error message (the default is "the server failed to run the job").
+        """
+        super().__init__(message)
@@ -1,11 +1,11 @@
 """
 '''
 Description: a patch for Pillow to save transparent GIF images
-Version: 1.0.2.20211010
+Version: 1.1.0.20261019
 Author: egocarib (https://github.com/egocarib)
 Date: 2021-09-19 13:12:58
 Last Editors: Arvin Zhao
-LastEditTime: 2021-10-10 10:42:08
+LastEditTime: 2026-10-19 11:05:47
 '''
 """
 
@@ -24,10 +24,31 @@ from pathlib import Path
 from random import randrange
 from typing import List, Tuple, Union
 
-from PIL.Image import Image
+from PIL import features
+from PIL.Image import (
+    FASTOCTREE,
+    FLOYDSTEINBERG,
+    LIBIMAGEQUANT,
+    MAXCOVERAGE,
+    MEDIANCUT,
+    NONE,
+    Image,
+)
 
 ALPHA_THRESHOLD = 128
 EXT_TARGET = "GIF"
+QUANTIZE_PRESET = "web"
+# The presets for quantising the RGBA frames to mode `P`. `method` being `None` means to convert with the web palette,
+# which has a fixed number of colours. 255 colours at most are kept for the quantisers by default so that the palette
+# index 0 is free for the transparent colour.
+QUANTIZE_PRESETS = {
+    "web": dict(dither=FLOYDSTEINBERG, method=None),
+    "fast": dict(colors=255, dither=NONE, method=FASTOCTREE),
+    "balanced": dict(colors=255, dither=FLOYDSTEINBERG, method=FASTOCTREE),
+    "quality": dict(
+        colors=255, dither=FLOYDSTEINBERG, method=LIBIMAGEQUANT
+    ),  # Fall back to `MEDIANCUT` if Pillow is not built with libimagequant.
+}
 
 
 class TransparentAnimatedGifConverter:
@@ -35,7 +56,12 @@ class TransparentAnimatedGifConverter:
 
     __PALETTE_SLOTSET = set(range(256))
 
-    def __init__(self, img_rgba: Image, alpha_threshold: int = ALPHA_THRESHOLD) -> None:
+    def __init__(
+        self,
+        img_rgba: Image,
+        alpha_threshold: int = ALPHA_THRESHOLD,
+        quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
+    ) -> None:
         """The constructor of the class for defining a transparent animated GIF converter.
 
         Parameters
@@ -44,9 +70,19 @@ class TransparentAnimatedGifConverter:
             The initial image frame.
         alpha_threshold : int, optional
             The threshold for the alpha channel (the default is defined by a constant `ALPHA_THRESHOLD`).
+        quantize_preset : str or dict, optional
+            The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys (`colors`, `dither`, and
+            `method`) for quantising the frame (the default is defined by a constant `QUANTIZE_PRESET`).
+
+        Raises
+        ------
+        ValueError
+            The quantize preset is invalid. Check the preset name or dictionary. This error comes from a called
+            function.
         """
         self.__img_rgba = img_rgba
         self.__alpha_threshold = alpha_threshold
+        self.__quantize_preset = get_quantize_preset(quantize_preset=quantize_preset)
         self.__img_p = None
         self.__img_p_data = None
         self.__palette_replaces = None
@@ -160,6 +196,32 @@ class TransparentAnimatedGifConverter:
         )
         self.__img_p.putpalette(data=final_palette)
 
+    def __quantize(self) -> Image:
+        """Return the mode `P` `Image` quantised from the initial image frame with the quantize preset.
+
+        Returns
+        -------
+        Image
+            The mode `P` `Image` quantised from the initial image frame.
+        """
+        dither = self.__quantize_preset["dither"]
+        method = self.__quantize_preset["method"]
+
+        if method is None:
+            return self.__img_rgba.convert(dither=dither, mode="P")
+
+        if method == LIBIMAGEQUANT and not features.check_feature("libimagequant"):
+            method = MEDIANCUT
+
+        # The alpha channel is handled by the threshold, so only the RGB colours are quantised.
+        img_rgb = self.__img_rgba.convert(mode="RGB")
+        img_p = img_rgb.quantize(colors=self.__quantize_preset["colors"], method=method)
+
+        # Pillow only dithers when quantising with a given palette, so the pixels are mapped again with the new palette.
+        return (
+            img_p if dither == NONE else img_rgb.quantize(dither=dither, palette=img_p)
+        )
+
     def process(self) -> Image:
         """Return the processed mode `P` `Image`.
 
@@ -168,7 +230,7 @@ class TransparentAnimatedGifConverter:
         Image
             The processed mode `P` `Image`.
         """
-        self.__img_p = self.__img_rgba.convert(mode="P")
+        self.__img_p = self.__quantize()
         self.__img_p_data = bytearray(self.__img_p.tobytes())
         self.__palette_replaces = dict(idx_from=list(), idx_to=list())
         self.__process_pixels()
@@ -180,10 +242,74 @@ class TransparentAnimatedGifConverter:
         return self.__img_p
 
 
+def get_quantize_preset(quantize_preset: Union[str, dict]) -> dict:
+    """Return the validated quantize preset with all keys filled in.
+
+    Parameters
+    ----------
+    quantize_preset : str or dict
+        The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys. In a dictionary, `method` is
+        `None` (the web palette) by default, `dither` is `FLOYDSTEINBERG` by default, and `colors` (1-256) is only
+        allowed with a quantiser method and is 255 by default.
+
+    Returns
+    -------
+    dict
+        The validated quantize preset.
+
+    Raises
+    ------
+    ValueError
+        The quantize preset is invalid. Check the preset name or dictionary.
+    """
+    if isinstance(quantize_preset, str):
+        if quantize_preset not in QUANTIZE_PRESETS:
+            raise ValueError(quantize_preset + " is not a valid quantize preset")
+
+        return dict(QUANTIZE_PRESETS[quantize_preset])
+
+    if not isinstance(quantize_preset, dict):
+        raise ValueError("a quantize preset should be a name or a dictionary")
+
+    unknown_keys = set(quantize_preset) - {"colors", "dither", "method"}
+
+    if unknown_keys:
+        raise ValueError(
+            "unknown quantize preset key(s): " + ", ".join(sorted(unknown_keys))
+        )
+
+    dither = quantize_preset.get("dither", FLOYDSTEINBERG)
+    method = quantize_preset.get("method")
+
+    if dither not in (NONE, FLOYDSTEINBERG):
+        raise ValueError(str(dither) + " is not a valid dither")
+
+    if method is None:
+        if "colors" in quantize_preset:
+            raise ValueError("colors is not supported with the web palette")
+
+        return dict(dither=dither, method=None)
+
+    if method not in (FASTOCTREE, LIBIMAGEQUANT, MAXCOVERAGE, MEDIANCUT):
+        raise ValueError(str(method) + " is not a valid quantize method")
+
+    colors = quantize_preset.get("colors", 255)
+
+    if (
+        isinstance(colors, bool)
+        or not isinstance(colors, int)
+        or not 1 <= colors <= 256
+    ):
+        raise ValueError(str(colors) + " is not a valid number of colours (1-256)")
+
+    return dict(colors=colors, dither=dither, method=method)
+
+
 def create_animated_gif(
     durations: Union[int, List[int]],
     images: List[Image],
     alpha_threshold: int = ALPHA_THRESHOLD,
+    quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
 ) -> Tuple[Image, dict]:
     """
     If the image is a GIF, create its thumbnail here.
@@ -196,6 +322,9 @@ def create_animated_gif(
         A list of PIL Image objects that compose the GIF frames.
     alpha_threshold : int, optional
         The threshold for the alpha channel (the default is defined by a constant `ALPHA_THRESHOLD`).
+    quantize_preset : str or dict, optional
+        The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys for quantising the frames (the
+        default is defined by a constant `QUANTIZE_PRESET`).
 
     Returns
     -------
@@ -203,7 +332,13 @@ def create_animated_gif(
         The output image.
     **save_kwargs : dict, optional
         The additional arguments for the file saving operation.
+
+    Raises
+    ------
+    ValueError
+        The quantize preset is invalid. Check the preset name or dictionary. This error comes from a called function.
     """
+    quantize_preset = get_quantize_preset(quantize_preset=quantize_preset)
     save_kwargs = dict()
     new_images: List[Image] = []
 
@@ -212,7 +347,9 @@ def create_animated_gif(
         thumbnail_rgba = thumbnail.convert(mode="RGBA")
         thumbnail_rgba.thumbnail(reducing_gap=3.0, size=frame.size)
         converter = TransparentAnimatedGifConverter(
-            alpha_threshold=alpha_threshold, img_rgba=thumbnail_rgba
+            alpha_threshold=alpha_threshold,
+            img_rgba=thumbnail_rgba,
+            quantize_preset=quantize_preset,
         )
         thumbnail_p = converter.process()  # Type: Image.
         new_images.append(thumbnail_p)
@@ -235,6 +372,7 @@ def save_transparent_gif(
     images: List[Image],
     save_file: Union[str, bytes, Path],
     alpha_threshold: int = ALPHA_THRESHOLD,
+    quantize_preset: Union[str, dict] = QUANTIZE_PRESET,
 ) -> None:
     """Create a transparent GIF, adjusting to avoid transparency issues that are present in the PIL library.
 
@@ -251,18 +389,27 @@ def save_transparent_gif(
         `PIL.Image.save()` method).
     alpha_threshold : int, optional
         The threshold for the alpha channel (the default is defined by a constant `ALPHA_THRESHOLD`).
+    quantize_preset : str or dict, optional
+        The name of a preset in `QUANTIZE_PRESETS`, or a dictionary with the same keys for quantising the frames (the
+        default is defined by a constant `QUANTIZE_PRESET`).
 
     Raises
     ------
     ValueError
-        The path for saving a GIF image is invalid; ensure that the file extension is correct.
+        The path for saving a GIF image is invalid; ensure that the file extension is correct. The quantize preset is
+        invalid; check the preset name or dictionary.
     """
+    quantize_preset = get_quantize_preset(quantize_preset=quantize_preset)
+
     if isinstance(save_file, (str, Path)) and not str(save_file).upper().endswith(
         EXT_TARGET
     ):
         raise ValueError("not a valid path for saving a GIF image.")
 
     root_frame, save_args = create_animated_gif(
-        alpha_threshold=alpha_threshold, durations=durations, images=images
+        alpha_threshold=alpha_threshold,
+        durations=durations,
+        images=images,
+        quantize_preset=quantize_preset,
     )
     root_frame.save(fp=save_file, **save_args)
@@ -0,0 +1,405 @@
+"""
+'''
+Description: a persistent local server for SIC with a warm worker pool
+Version: 1.0.0.20261019
+Author: Arvin Zhao
+Date: 2026-10-19 13:20:41
+Last Editors: Arvin Zhao
+LastEditTime: 2026-10-19 13:20:41
+'''
+"""
+
+# The server keeps the worker processes alive between jobs, so each job only pays for the conversion itself rather
+# than the interpreter startup, the imports, and the worker spin-up. Jobs are sent over a Unix domain socket as
+# newline-delimited JSON objects, and each job gets a JSON object as the response in the same way. Pillow and the
+# engine are only imported by the worker processes to keep the client light. The server relies on Unix domain sockets,
+# so it is POSIX-only and needs Python 3.7+ for the worker initialiser.
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import List
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import tempfile
+
+if sys.version_info < (3, 7):
+    raise ImportError("the server for SIC requires Python 3.7+")
+
+try:
+    from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+except ImportError as e:
+    raise ImportError("the server for SIC requires Unix domain sockets") from e
+
+from src.pysic.errors import EmptyInputError, ServerError
+
+FAIL = "Fail:"
+
+ENCODING = "utf-8"
+# A per-user socket path, so users on the same machine neither collide nor connect to each other's servers.
+SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+    "pysic-" + str(os.getuid()) + ".sock",
+)
+# The errors that can be raised by SIC and re-raised by the client as they are.
+_ERRORS = {
+    error.__name__: error
+    for error in (EmptyInputError, FileExistsError, FileNotFoundError, ValueError)
+}
+
+
+def _init_worker() -> None:
+    """Initialise a worker process by registering all Pillow plugins once, so jobs reuse the loaded decoders."""
+    from PIL import Image
+
+    from src.pysic import engine  # Warm up the imports of the engine.
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Leave the shutdown to the server.
+    Image.init()
+
+
+def _run_job(job: dict) -> dict:
+    """Run a conversion job in a worker process.
+
+    Parameters
+    ----------
+    job : dict
+        The conversion job with the key `input_path` for the constructor of `SIC` and the key `kwargs` for
+        `SIC.convert()`.
+
+    Returns
+    -------
+    dict
+        The response with a flag `ok`, and the list of failed conversion tasks if the job runs, or the error name and
+        message if the job fails.
+    """
+    from src.pysic.engine import SIC
+
+    try:
+        fail_tasks = SIC(has_pbar=False, input_path=job["input_path"]).convert(
+            **job["kwargs"]
+        )
+        return dict(fail_tasks=fail_tasks, ok=True)
+    except Exception as e:
+        return dict(error=type(e).__name__, message=str(e), ok=False)
+
+
+class _SICRequestHandler(StreamRequestHandler):
+    """The class for defining the handler of the connections to the server."""
+
+    def handle(self) -> None:
+        """Run the conversion jobs sent by a client until the connection is closed."""
+        for line in self.rfile:
+            try:
+                job = json.loads(line.decode(ENCODING))
+                response = self.server.run_job(job=job)
+            except (KeyError, TypeError, ValueError) as e:
+                response = dict(error=type(e).__name__, message=str(e), ok=False)
+
+            self.wfile.write((json.dumps(response) + "\n").encode(ENCODING))
+            self.wfile.flush()
+
+
+class SICServer(ThreadingUnixStreamServer):
+    """The class for defining a persistent local server for SIC with a warm worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = SOCKET_PATH, workers: int = None) -> None:
+        """The constructor of the class for defining a persistent local server for SIC with a warm worker pool.
+
+        Parameters
+        ----------
+        socket_path : str, optional
+            The path to the Unix domain socket (the default is defined by a constant `SOCKET_PATH`).
+        workers : int, optional
+            The number of the worker processes (the default is `None`, which means the number of CPUs).
+
+        Raises
+        ------
+        FileExistsError
+            The socket path is in use by a running server, is not a socket, or cannot be removed. Check the socket path.
+        """
+        if os.path.lexists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise FileExistsError("not a socket: " + socket_path)
+
+            try:
+                SICClient(socket_path=socket_path).close()
+            except OSError:
+                try:
+                    # A stale socket left by a server that did not exit properly.
+                    os.remove(socket_path)
+                except PermissionError:
+                    raise FileExistsError(
+                        "cannot remove the stale socket " + socket_path
+                    )
+            else:
+                raise FileExistsError("a server is running at " + socket_path)
+
+        self.__lock = Lock()
+        self.__workers = os.cpu_count() if workers is None else workers
+        self.__pool = self.__create_pool()
+        self.__socket_path = socket_path
+        super().__init__(socket_path, _SICRequestHandler)
+
+    def __create_pool(self) -> ProcessPoolExecutor:
+        """Create a pool of warm worker processes.
+
+        Returns
+        -------
+        ProcessPoolExecutor
+            The pool of warm worker processes.
+        """
+        pool = ProcessPoolExecutor(initializer=_init_worker, max_workers=self.__workers)
+
+        for future in [pool.submit(int) for _ in range(self.__workers)]:
+            future.result()  # Start the worker processes before any job arrives.
+
+        return pool
+
+    def run_job(self, job: dict) -> dict:
+        """Run a conversion job with the worker pool, and replace the pool if a worker process dies.
+
+        Parameters
+        ----------
+        job : dict
+            The conversion job with the key `input_path` for the constructor of `SIC` and the key `kwargs` for
+            `SIC.convert()`.
+
+        Returns
+        -------
+        dict
+            The response with a flag `ok`, and the list of failed conversion tasks if the job runs, or the error name
+            and message if the job fails.
+        """
+        with self.__lock:
+            pool = self.__pool
+
+        try:
+            return pool.submit(_run_job, job).result()
+        except BrokenProcessPool:
+            with self.__lock:
+                # Other jobs on the broken pool may have replaced it already.
+                if self.__pool is pool:
+                    self.__pool = self.__create_pool()
+                    pool.shutdown(wait=False)
+
+            return dict(
+                error=ServerError.__name__,
+                message="a worker process died while running the job",
+                ok=False,
+            )
+
+    def server_bind(self) -> None:
+        """Bind the socket and only allow the current user to connect to it."""
+        umask = os.umask(0o177)  # Avoid a window when other users could connect.
+
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self) -> None:
+        """Close the server, stop the worker processes, and remove the socket file."""
+        super().server_close()
+        self.__pool.shutdown()
+
+        if os.path.exists(self.__socket_path):
+            os.remove(self.__socket_path)
+
+
+class SICClient:
+    """The class for defining a client of the persistent local server for SIC."""
+
+    def __init__(self, socket_path: str = SOCKET_PATH) -> None:
+        """The constructor of the class for defining a client of the persistent local server for SIC.
+
+        Parameters
+        ----------
+        socket_path : str, optional
+            The path to the Unix domain socket (the default is defined by a constant `SOCKET_PATH`).
+        """
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__socket.connect(socket_path)
+        self.__file = self.__socket.makefile(mode="rwb")
+
+    def __enter__(self) -> "SICClient":
+        """Return the client itself for the `with` statement.
+
+        Returns
+        -------
+        SICClient
+            The client itself.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the connection to the server when leaving the `with` statement."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        self.__file.close()
+        self.__socket.close()
+
+    def convert(self, input_path: str, to_fmt: str, **kwargs) -> list:
+        """Ask the server to perform the image conversion tasks.
+
+        Parameters
+        ----------
+        input_path : str
+            The path to an input image, the directory for locating the input image(s), or a ZIP/TAR archive containing
+            the input image(s).
+        to_fmt : str
+            The target image format for conversion.
+        **kwargs : dict, optional
+            The other arguments for `SIC.convert()`.
+
+        Returns
+        -------
+        list
+            A list of failed conversion tasks.
+
+        Raises
+        ------
+        EmptyInputError
+            The input directory/archive contains no image for conversion. Check the input path.
+        FileExistsError
+            The output directory is not empty, or the output archive exists. Check the output directory/archive.
+        FileNotFoundError
+            The path to an input image or the directory for locating the input image(s) does not exist. Check the input
+            path.
+        ServerError
+            The server fails to run the job for any other reason.
+        ValueError
+            The target image format for conversion, the output archive format, or the quantize preset is not supported.
+            Check the target format, the output archive path, or the preset name.
+        """
+        job = dict(
+            input_path=os.path.abspath(input_path),
+            kwargs=dict(kwargs, to_fmt=to_fmt),
+        )
+
+        for key in ("output_archive", "output_dir"):
+            if job["kwargs"].get(key) is not None:
+                job["kwargs"][key] = os.path.abspath(
+                    job["kwargs"][key]
+                )  # The server may run in another working directory.
+
+        self.__file.write((json.dumps(job) + "\n").encode(ENCODING))
+        self.__file.flush()
+        line = self.__file.readline()
+
+        if not line:
+            raise ServerError("the server closed the connection")
+
+        response = json.loads(line.decode(ENCODING))
+
+        if not response["ok"]:
+            error = _ERRORS.get(response["error"])
+
+            if error is not None:
+                raise error(response["message"])
+
+            raise ServerError(response["error"] + ": " + response["message"])
+
+        return response["fail_tasks"]
+
+
+def main(args: List[str] = None) -> None:
+    """Run the command line interface of the persistent local server for SIC.
+
+    Parameters
+    ----------
+    args : List[str], optional
+        The command line arguments (the default is `None`, which means `sys.argv`).
+    """
+    parser = ArgumentParser(description="A persistent local server for SIC.")
+    parser.add_argument(
+        "--socket",
+        default=SOCKET_PATH,
+        dest="socket_path",
+        help="the path to the Unix domain socket",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+    serve_parser = subparsers.add_parser("serve", help="start the server")
+    serve_parser.add_argument(
+        "--workers", type=int, help="the number of the worker processes"
+    )
+    convert_parser = subparsers.add_parser(
+        "convert", help="send a conversion job to the server"
+    )
+    convert_parser.add_argument("input_path", help="the path to the input")
+    convert_parser.add_argument("to_fmt", help="the target image format")
+    convert_parser.add_argument(
+        "--init-output",
+        action="store_true",
+        dest="has_init_output",
+        help="clean up the output directory/archive first",
+    )
+    convert_parser.add_argument(
+        "--no-input-structure",
+        action="store_false",
+        dest="has_input_structure",
+        help="do not keep the file structure of the input directory/archive",
+    )
+    convert_parser.add_argument(
+        "--output-archive", help="the path to a ZIP/TAR archive for the output"
+    )
+    convert_parser.add_argument("--output-dir", help="the output directory")
+    convert_parser.add_argument("--quantize-preset", help="the GIF quantize preset")
+    args = parser.parse_args(args)
+
+    if args.command == "serve":
+        try:
+            server = SICServer(socket_path=args.socket_path, workers=args.workers)
+        except FileExistsError as file_exists:
+            parser.exit(message=FAIL + " " + str(file_exists) + "\n", status=1)
+
+        # Stop the server in the same way for both Ctrl+C and the termination signal.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        with server:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    else:
+        kwargs = dict(
+            has_init_output=args.has_init_output,
+            has_input_structure=args.has_input_structure,
+            output_archive=args.output_archive,
+            output_dir=args.output_dir,
+        )
+
+        if args.quantize_preset is not None:
+            kwargs.update(quantize_preset=args.quantize_preset)
+
+        try:
+            with SICClient(socket_path=args.socket_path) as client:
+                fail_tasks = client.convert(
+                    input_path=args.input_path, to_fmt=args.to_fmt, **kwargs
+                )
+        except (EmptyInputError, OSError, ServerError, ValueError) as e:
+            parser.exit(message=FAIL + " " + str(e) + "\n", status=1)
+
+        if fail_tasks:
+            parser.exit(
+                message="".join(
+                    "Failed to convert " + fail_task + "\n" for fail_task in fail_tasks
+                ),
+                status=1,
+            )
+
+
+if __name__ == "__main__":
+    main()
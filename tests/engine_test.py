@@ -1,23 +1,34 @@
 """
 '''
 Description: the unit test of the simple image converter's engine
-Version: 1.0.0.20211017
+Version: 1.1.0.20261019
 Author: Arvin Zhao
 Date: 2021-09-26 23:57:52
 Last Editors: Arvin Zhao
-LastEditTime: 2021-10-17 10:42:47
+LastEditTime: 2026-10-20 09:41:26
 '''
 """
 
+from io import BytesIO
+from pathlib import Path
+from shutil import rmtree
+from unittest import mock
 import os
+import tarfile
+import tempfile
 import unittest
+import zipfile
+
+from PIL import Image
 
 # Test local install the package.
 # from pysic.engine import SIC
 # from pysic.errors import EmptyInputError
+# from pysic.pillow_gif_patch import QUANTIZE_PRESETS, save_transparent_gif
 
 from src.pysic.engine import SIC
 from src.pysic.errors import EmptyInputError
+from src.pysic.pillow_gif_patch import QUANTIZE_PRESETS, save_transparent_gif
 
 
 class EngineTest(unittest.TestCase):
@@ -66,6 +77,217 @@ class EngineTest(unittest.TestCase):
 
         return False
 
+    @staticmethod
+    def __save_gif(quantize_preset) -> Image.Image:
+        """Save a generated gradient image with transparent corners as a GIF image and open it again.
+
+        Parameters
+        ----------
+        quantize_preset : str or dict
+            The quantize preset for the GIF image.
+
+        Returns
+        -------
+        Image.Image
+            The saved GIF image.
+        """
+        img = Image.merge(
+            "RGBA",
+            (
+                Image.linear_gradient("L"),
+                Image.linear_gradient("L").rotate(90),
+                Image.radial_gradient("L"),
+                Image.radial_gradient("L").point(lambda x: 0 if x > 160 else 255),
+            ),
+        )
+        output_file = BytesIO()
+        save_transparent_gif(
+            durations=0,
+            images=[img],
+            quantize_preset=quantize_preset,
+            save_file=output_file,
+        )
+        return Image.open(output_file)
+
+    def __make_archive(self) -> str:
+        """Create a ZIP archive of generated test images in a temporary directory.
+
+        Returns
+        -------
+        str
+            The path to the archive.
+        """
+        input_path = os.path.join(self.__tmp_dir, "img.zip")
+
+        with zipfile.ZipFile(input_path, "w") as archive:
+            for name in (
+                "a.png",
+                "sub/a.png",
+                "sub/b.gif",
+                "../c.png",
+                "a\\..\\..\\b/d.png",
+                "C:/x/e.png",
+                "..",
+            ):
+                img = BytesIO()
+                Image.new(color=(255, 0, 0, 128), mode="RGBA", size=(8, 8)).save(
+                    img, format=os.path.splitext(name)[1][1:] or "PNG"
+                )
+                archive.writestr(name, img.getvalue())
+
+        return input_path
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the archive tests."""
+        self.__tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory for the archive tests."""
+        rmtree(self.__tmp_dir)
+
+    def test_convert_archive_to_gif(self) -> None:
+        """Test the image conversion function's ability to convert to GIF images from and into archives."""
+        input_path = self.__make_archive()
+        output_archive = os.path.join(self.__tmp_dir, "output.tar.gz")
+        fail_tasks = SIC(has_pbar=False, input_path=input_path).convert(
+            output_archive=output_archive, to_fmt="GIF"
+        )
+
+        with tarfile.open(output_archive) as archive:
+            self.assertEqual(
+                sorted(archive.getnames()),
+                ["a.gif", "c.gif", "d.gif", "sub/a.gif", "sub/b.gif", "x/e.gif"],
+            )  # The structure is kept and the parts pointing outside the output are removed.
+
+        self.assertEqual(fail_tasks, [input_path + ":.."])
+
+    def test_convert_archive_to_dir(self) -> None:
+        """Test the image conversion function's ability to convert from an archive into a directory."""
+        input_path = self.__make_archive()
+        output_dir = os.path.join(self.__tmp_dir, "output")
+        SIC(input_path=Path(input_path)).convert(
+            output_dir=Path(output_dir), to_fmt="GIF"
+        )  # Also with the progress bar.
+
+        for name in ("a.gif", "c.gif", "d.gif", "sub/a.gif", "sub/b.gif", "x/e.gif"):
+            self.assertTrue(os.path.isfile(os.path.join(output_dir, name)))
+
+        with zipfile.ZipFile(input_path) as archive:
+            with open(os.path.join(output_dir, "sub", "b.gif"), "rb") as f:
+                self.assertEqual(
+                    f.read(), archive.read("sub/b.gif")
+                )  # A GIF image is copied as it is.
+
+    def test_convert_dir_to_archive(self) -> None:
+        """Test the image conversion function's ability to convert from a directory named like an archive into an
+        archive."""
+        input_path = os.path.join(self.__tmp_dir, "assets.zip")
+        os.makedirs(os.path.join(input_path, "sub"))
+        Image.new(mode="RGBA", size=(8, 8)).save(os.path.join(input_path, "a.png"))
+        Image.new(mode="RGBA", size=(8, 8)).save(
+            os.path.join(input_path, "sub", "b.png")
+        )
+        output_archive = os.path.join(self.__tmp_dir, "output.tar")
+        SIC(has_pbar=False, input_path=input_path).convert(
+            output_archive=Path(output_archive), to_fmt="GIF"
+        )
+
+        with tarfile.open(output_archive) as archive:
+            self.assertEqual(sorted(archive.getnames()), ["a.gif", "sub/b.gif"])
+
+    def test_convert_archive_without_structure(self) -> None:
+        """Test the image conversion function's ability to refuse duplicate names in a flat output archive."""
+        output_archive = os.path.join(self.__tmp_dir, "output.zip")
+        SIC(has_pbar=False, input_path=self.__make_archive()).convert(
+            has_input_structure=False, output_archive=output_archive, to_fmt="GIF"
+        )
+
+        with zipfile.ZipFile(output_archive) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                ["a.gif", "b.gif", "c.gif", "d.gif", "e.gif"],
+            )
+
+    def test_quantize_presets(self) -> None:
+        """Test the GIF quantize presets' ability to keep the palette index 0 for the transparent colour."""
+        for quantize_preset in QUANTIZE_PRESETS:
+            with self.subTest(quantize_preset=quantize_preset):
+                img = self.__save_gif(quantize_preset=quantize_preset)
+                self.assertEqual(img.info["transparency"], 0)
+                self.assertEqual(img.getpixel((0, 0)), 0)  # A transparent corner.
+
+                if quantize_preset != "web":
+                    self.assertLessEqual(
+                        len(img.getcolors()), 256
+                    )  # 255 colours at most and the transparent colour.
+                    self.assertNotIn(
+                        0, img.crop((96, 96, 160, 160)).tobytes()
+                    )  # The opaque centre does not use the transparent colour.
+
+    def test_quantize_colors(self) -> None:
+        """Test the GIF quantize presets' ability to limit the colour count."""
+        img = self.__save_gif(quantize_preset=dict(QUANTIZE_PRESETS["fast"], colors=8))
+        self.assertLessEqual(
+            len(img.getcolors()), 9
+        )  # 8 colours and the transparent colour.
+
+    def test_quantize_dither(self) -> None:
+        """Test the GIF quantize presets' ability to dither with the quantised palette."""
+        preset = dict(QUANTIZE_PRESETS["fast"], colors=8)
+        self.assertNotEqual(
+            self.__save_gif(quantize_preset=preset).tobytes(),
+            self.__save_gif(
+                quantize_preset=dict(preset, dither=Image.FLOYDSTEINBERG)
+            ).tobytes(),
+        )
+
+    def test_quantize_libimagequant_fallback(self) -> None:
+        """Test the GIF quantize presets' ability to fall back to median cut without libimagequant."""
+        with mock.patch(
+            "src.pysic.pillow_gif_patch.features.check_feature", return_value=False
+        ):
+            img = self.__save_gif(quantize_preset="quality")
+
+        self.assertEqual(img.info["transparency"], 0)
+        self.assertLessEqual(len(img.getcolors()), 256)
+
+    def test_quantize_invalid_preset(self) -> None:
+        """Test the GIF quantize presets' ability to reject invalid presets before any output is created."""
+        for quantize_preset in (
+            "bogus",
+            dict(colors=64),
+            dict(colours=8, method=Image.FASTOCTREE),
+            dict(colors=0, method=Image.FASTOCTREE),
+            dict(method=99),
+        ):
+            with self.subTest(quantize_preset=quantize_preset):
+                with self.assertRaises(ValueError):
+                    self.__save_gif(quantize_preset=quantize_preset)
+
+        output_dir = os.path.join(self.__tmp_dir, "output")
+
+        with self.assertRaises(ValueError):
+            SIC(has_pbar=False, input_path=self.__make_archive()).convert(
+                output_dir=output_dir, quantize_preset="bogus", to_fmt="PNG"
+            )
+
+        self.assertFalse(os.path.exists(output_dir))
+
+    def test_convert_corrupt_archive(self) -> None:
+        """Test the image conversion function's ability to reject a corrupt input archive."""
+        input_path = os.path.join(self.__tmp_dir, "img.tar")
+        output_archive = os.path.join(self.__tmp_dir, "output.zip")
+
+        with open(input_path, "wb") as f:
+            f.write(b"not an archive")
+
+        with self.assertRaises(ValueError):
+            SIC(has_pbar=False, input_path=input_path).convert(
+                output_archive=output_archive, to_fmt="GIF"
+            )
+
+        self.assertFalse(os.path.exists(output_archive))
+
     def test_convert_to_gif(self) -> None:
         """Test the image conversion function's ability to convert to GIF images."""
         self.assertTrue(self.__convert("GIF"))
@@ -0,0 +1,161 @@
+"""
+'''
+Description: the unit test of the persistent local server for SIC
+Version: 1.0.0.20261019
+Author: Arvin Zhao
+Date: 2026-10-19 14:02:37
+Last Editors: Arvin Zhao
+LastEditTime: 2026-10-20 10:26:54
+'''
+"""
+
+from multiprocessing import active_children
+from shutil import rmtree
+from threading import Thread
+import os
+import signal
+import stat
+import tempfile
+import time
+import unittest
+
+from PIL import Image
+
+# Test local install the package.
+# from pysic.errors import EmptyInputError, ServerError
+# from pysic.server import SICClient, SICServer
+
+from src.pysic.errors import EmptyInputError, ServerError
+from src.pysic.server import SICClient, SICServer
+
+
+class ServerTest(unittest.TestCase):
+    """The class for defining the unit test of the persistent local server for SIC."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Start a server with a warm worker pool in the background for all tests."""
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.socket_path = os.path.join(cls.tmp_dir, "pysic.sock")
+        cls.server = SICServer(socket_path=cls.socket_path, workers=1)
+        Thread(daemon=True, target=cls.server.serve_forever).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Stop the server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+        rmtree(cls.tmp_dir)
+
+    def __convert(self, to_fmt: str) -> bool:
+        """Execute the image conversion function properly through the server.
+
+        Parameters
+        ----------
+        to_fmt : str
+            The target image format for conversion.
+
+        Returns
+        -------
+        bool
+            A flag indicating if the conversion is valid.
+        """
+        print("Target format:", to_fmt)
+
+        try:
+            with SICClient(socket_path=self.socket_path) as client:
+                for _ in range(2):  # The second job reuses the warm worker.
+                    client.convert(
+                        has_init_output=True,
+                        input_path=os.path.join("cases", "img"),
+                        to_fmt=to_fmt,
+                    )
+
+            return True  # TODO: real conversion check?
+        except (EmptyInputError, OSError, ServerError, ValueError) as e:
+            print("Fail:", e)
+
+        return False
+
+    def test_convert_to_gif(self) -> None:
+        """Test the server's ability to convert to GIF images."""
+        self.assertTrue(self.__convert("GIF"))
+
+    def test_convert_to_invalid_fmt(self) -> None:
+        """Test the server's ability to pass the errors of the jobs to the client."""
+        input_path = os.path.join(self.tmp_dir, "c.png")
+        Image.new(mode="RGBA", size=(8, 8)).save(input_path)
+
+        with SICClient(socket_path=self.socket_path) as client:
+            with self.assertRaises(ValueError):
+                client.convert(
+                    has_init_output=True,
+                    input_path=input_path,
+                    output_dir=os.path.join(self.tmp_dir, "output_invalid"),
+                    to_fmt="invalid",
+                )
+
+    def test_convert_with_fail_tasks(self) -> None:
+        """Test the server's ability to report the failed conversion tasks to the client."""
+        input_dir = os.path.join(self.tmp_dir, "img")
+        os.makedirs(os.path.join(input_dir, "sub"))
+        Image.new(mode="RGBA", size=(8, 8)).save(os.path.join(input_dir, "a.png"))
+
+        with open(os.path.join(input_dir, "sub", "readme.txt"), "w") as f:
+            f.write("not an image")
+
+        with SICClient(socket_path=self.socket_path) as client:
+            fail_tasks = client.convert(
+                has_init_output=True, input_path=input_dir, to_fmt="GIF"
+            )
+
+        self.assertEqual(fail_tasks, [os.path.join(input_dir, "sub", "readme.txt")])
+
+    def test_socket_permission(self) -> None:
+        """Test the server's ability to only allow the current user to connect to the socket."""
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_socket_path_not_socket(self) -> None:
+        """Test the server's ability to refuse to replace a file which is not a socket."""
+        socket_path = os.path.join(self.tmp_dir, "not_socket.txt")
+
+        with open(socket_path, "w") as f:
+            f.write("keep me")
+
+        with self.assertRaises(FileExistsError):
+            SICServer(socket_path=socket_path, workers=1)
+
+        with open(socket_path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+    def test_worker_died(self) -> None:
+        """Test the server's ability to fail the job and replace the pool when a worker process dies."""
+        for worker in active_children():
+            os.kill(worker.pid, signal.SIGKILL)
+
+        time.sleep(0.5)  # Let the pool notice the dead worker.
+        input_path = os.path.join(self.tmp_dir, "b.png")
+        Image.new(mode="RGBA", size=(8, 8)).save(input_path)
+        kwargs = dict(
+            has_init_output=True,
+            input_path=input_path,
+            output_dir=os.path.join(self.tmp_dir, "output_worker"),
+            to_fmt="GIF",
+        )
+
+        with SICClient(socket_path=self.socket_path) as client:
+            with self.assertRaises(ServerError):
+                client.convert(**kwargs)
+
+            self.assertEqual(
+                client.convert(**kwargs), []
+            )  # The replaced pool runs the next job.
+
+    def test_server_exists(self) -> None:
+        """Test the server's ability to refuse to start on a socket path in use."""
+        with self.assertRaises(FileExistsError):
+            SICServer(socket_path=self.socket_path, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()